@@ -0,0 +1,245 @@
+from linaris.geometry.vector import Vec, points_to_array, array_to_points
+import heapq
+import numpy as np
+
+class InvalidQueryError(Exception):
+     pass
+
+
+def pairwise_distances(a, b=None, block_size=None, out=None):
+     """
+     Returns the (n, m) matrix of euclidean distances between the points of a and b (a with itself when b is None).
+     Rows are computed block_size at a time into two (block_size, m) buffers; by default block_size is chosen so that
+     each buffer holds about a million entries. out may be an np.memmap
+     """
+
+     a = points_to_array(a, error=InvalidQueryError)
+     b = a if b is None else points_to_array(b, a.shape[1], InvalidQueryError)
+     if block_size is None:
+          block_size = max(1, 2**20//max(len(b), 1))
+     if block_size < 1:
+          raise InvalidQueryError("The block size must be positive")
+     if out is None:
+          out = np.empty((len(a), len(b)))
+     elif out.shape != (len(a), len(b)):
+          raise InvalidQueryError(f"Expected an output array of shape {(len(a), len(b))}, received {out.shape}")
+
+     rows = min(block_size, len(a))
+     squared = np.empty((rows, len(b)))
+     diff = np.empty((rows, len(b)))
+     for start in range(0, len(a), block_size):
+          block = a[start:start + block_size]
+          acc, tmp = squared[:len(block)], diff[:len(block)]
+          acc.fill(0)
+          # differences are taken directly, one axis at a time; expanding |x - y|^2 loses precision through cancellation
+          for axis in range(a.shape[1]):
+               np.subtract(block[:, axis, None], b[None, :, axis], out=tmp)
+               tmp *= tmp
+               acc += tmp
+          out[start:start + block_size] = np.sqrt(acc, out=acc)
+     return out
+
+
+class KDTree:
+     def __init__(self, points, leaf_size=16):
+          """
+          Builds a k-d tree over a collection of vectors or an (n, d) array in O(n log n).
+          The tree is stored implicitly: every subrange of the permuted points is a node and its median is the split point
+          """
+
+          if leaf_size < 1:
+               raise InvalidQueryError("The leaf size must be positive")
+
+          if isinstance(points, np.ndarray):
+               self.vectors = None
+               # the build permutes rows in place, so the caller's array is copied once
+               self._sorted = np.array(points_to_array(points, error=InvalidQueryError), dtype=float)
+          else:
+               self.vectors = list(points)
+               self._sorted = np.asarray(points_to_array(self.vectors, error=InvalidQueryError), dtype=float)
+          self.leaf_size = leaf_size
+          self.dimension = self._sorted.shape[1]
+
+          n = len(self._sorted)
+          self.indices = np.arange(n)
+          self._split_dim = np.zeros(n, dtype=np.intp)
+          self._positions = None
+          self._build()
+
+     def __len__(self):
+          return len(self._sorted)
+
+     def __repr__(self):
+          return f"KDTree(n={len(self)}, dimension={self.dimension})"
+
+     def _build(self):
+          stack = [(0, len(self))]
+          while stack:
+               lo, hi = stack.pop()
+               if hi - lo <= self.leaf_size:
+                    continue
+
+               # splits along the axis with the largest spread; argpartition finds the median in linear time
+               subset = self._sorted[lo:hi]
+               dim = int(np.argmax(subset.max(axis=0) - subset.min(axis=0)))
+               mid = (lo + hi)//2
+               order = np.argpartition(subset[:, dim], mid - lo)
+               self._sorted[lo:hi] = subset[order]
+               self.indices[lo:hi] = self.indices[lo:hi][order]
+               self._split_dim[mid] = dim
+
+               stack.append((lo, mid))
+               stack.append((mid + 1, hi))
+
+     def _validate_query(self, point):
+          point = np.asarray(list(point) if isinstance(point, Vec) else point, dtype=float)
+          if point.shape != (self.dimension,):
+               raise InvalidQueryError(f"Expected a point of dimension {self.dimension}, received shape {point.shape}")
+          return point
+
+     def _validate_k(self, k):
+          if k < 1:
+               raise InvalidQueryError("k must be positive")
+          if len(self) == 0:
+               raise InvalidQueryError("Cannot query an empty tree")
+          return min(k, len(self))
+
+     def point(self, index):
+          """Returns the point at the index of the original collection, as it was passed to the tree"""
+
+          if self.vectors is not None:
+               return self.vectors[index]
+          # inverse of the build permutation, only needed (and built) when an array backed tree is asked for a point
+          if self._positions is None:
+               self._positions = np.empty(len(self), dtype=np.intp)
+               self._positions[self.indices] = np.arange(len(self))
+          return array_to_points(self._sorted[[self._positions[index]]])[0]
+
+     def query(self, point, k=1):
+          """Returns the distances and indices of the k nearest points to the query point, nearest first"""
+
+          point = self._validate_query(point)
+          k = self._validate_k(k)
+
+          # max-heap of the best k candidates as (-distance^2, index)
+          heap = []
+
+          def search(lo, hi):
+               if hi - lo <= self.leaf_size:
+                    if hi > lo:
+                         squared = ((self._sorted[lo:hi] - point)**2).sum(axis=1)
+                         for d, i in zip(squared.tolist(), self.indices[lo:hi].tolist()):
+                              if len(heap) < k:
+                                   heapq.heappush(heap, (-d, i))
+                              elif d < -heap[0][0]:
+                                   heapq.heapreplace(heap, (-d, i))
+                    return
+
+               mid = (lo + hi)//2
+               dim = self._split_dim[mid]
+               diff = point[dim] - self._sorted[mid, dim]
+               near, far = ((lo, mid), (mid + 1, hi)) if diff < 0 else ((mid + 1, hi), (lo, mid))
+
+               search(*near)
+               d = float(((self._sorted[mid] - point)**2).sum())
+               if len(heap) < k:
+                    heapq.heappush(heap, (-d, int(self.indices[mid])))
+               elif d < -heap[0][0]:
+                    heapq.heapreplace(heap, (-d, int(self.indices[mid])))
+               # the far side can only hold closer points if the splitting plane is within the current k-th distance
+               if len(heap) < k or diff*diff < -heap[0][0]:
+                    search(*far)
+
+          search(0, len(self))
+          best = sorted((-d, i) for d, i in heap)
+          return np.sqrt([d for d, _ in best]), np.array([i for _, i in best], dtype=np.intp)
+
+     def nearest(self, point):
+          """Returns the point closest to the query point"""
+
+          _, indices = self.query(point, k=1)
+          return self.point(int(indices[0]))
+
+     def query_radius(self, point, radius):
+          """Returns the indices of all points within the radius of the query point, nearest first"""
+
+          point = self._validate_query(point)
+          if radius < 0:
+               raise InvalidQueryError("The radius cannot be negative")
+
+          r_squared = radius*radius
+          found_d, found_i = [], []
+          stack = [(0, len(self))]
+          while stack:
+               lo, hi = stack.pop()
+               if hi - lo <= self.leaf_size:
+                    squared = ((self._sorted[lo:hi] - point)**2).sum(axis=1)
+                    mask = squared <= r_squared
+                    found_d.append(squared[mask])
+                    found_i.append(self.indices[lo:hi][mask])
+                    continue
+
+               mid = (lo + hi)//2
+               dim = self._split_dim[mid]
+               diff = point[dim] - self._sorted[mid, dim]
+               d = ((self._sorted[mid] - point)**2).sum()
+               if d <= r_squared:
+                    found_d.append(np.array([d]))
+                    found_i.append(self.indices[mid:mid + 1])
+
+               if diff <= radius:
+                    stack.append((lo, mid))
+               if diff >= -radius:
+                    stack.append((mid + 1, hi))
+
+          distances = np.concatenate(found_d) if found_d else np.empty(0)
+          indices = np.concatenate(found_i) if found_i else np.empty(0, dtype=np.intp)
+          return indices[np.argsort(distances, kind="stable")]
+
+     def query_box(self, lower, upper):
+          """Returns the indices of all points inside the axis aligned box spanned by the lower and upper corners"""
+
+          lower = self._validate_query(lower)
+          upper = self._validate_query(upper)
+          if np.any(lower > upper):
+               raise InvalidQueryError("Every component of the lower corner must not exceed the upper corner")
+
+          found = []
+          stack = [(0, len(self))]
+          while stack:
+               lo, hi = stack.pop()
+               if hi - lo <= self.leaf_size:
+                    block = self._sorted[lo:hi]
+                    mask = np.all((block >= lower) & (block <= upper), axis=1)
+                    found.append(self.indices[lo:hi][mask])
+                    continue
+
+               mid = (lo + hi)//2
+               dim = self._split_dim[mid]
+               split = self._sorted[mid, dim]
+               if np.all((self._sorted[mid] >= lower) & (self._sorted[mid] <= upper)):
+                    found.append(self.indices[mid:mid + 1])
+
+               if lower[dim] <= split:
+                    stack.append((lo, mid))
+               if upper[dim] >= split:
+                    stack.append((mid + 1, hi))
+
+          return np.sort(np.concatenate(found)) if found else np.empty(0, dtype=np.intp)
+
+     def query_many(self, points, k=1):
+          """Returns (m, k) arrays of distances and indices of the k nearest points for each of the m query points"""
+
+          points = points_to_array(points, self.dimension, InvalidQueryError)
+          k = self._validate_k(k)
+          distances = np.empty((len(points), k))
+          indices = np.empty((len(points), k), dtype=np.intp)
+          for row, point in enumerate(points):
+               distances[row], indices[row] = self.query(point, k)
+          return distances, indices
+
+     def query_radius_many(self, points, radius):
+          """Returns a list holding the indices within the radius of each query point"""
+
+          points = points_to_array(points, self.dimension, InvalidQueryError)
+          return [self.query_radius(point, radius) for point in points]
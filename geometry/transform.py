@@ -0,0 +1,201 @@
+from linaris.geometry.vector import Vec, points_to_array
+import math
+import numpy as np
+
+class InvalidTransformError(Exception):
+     pass
+
+
+def rotation_2d(theta):
+     """Returns the 2x2 matrix rotating points anticlockwise by theta radians about the origin"""
+
+     c, s = math.cos(theta), math.sin(theta)
+     return np.array([
+          [c, -s],
+          [s, c]
+     ])
+
+def rotation_3d(axis, theta):
+     """Returns the 3x3 matrix rotating points by theta radians about the axis (Rodrigues' formula)"""
+
+     axis = np.asarray(list(axis), dtype=float)
+     if axis.shape != (3,):
+          raise InvalidTransformError("The axis of rotation must be a three dimensional vector")
+
+     norm = np.linalg.norm(axis)
+     if norm == 0:
+          raise InvalidTransformError("Cannot rotate about a null vector")
+     x, y, z = axis/norm
+
+     # cross product matrix of the unit axis
+     K = np.array([
+          [0, -z, y],
+          [z, 0, -x],
+          [-y, x, 0]
+     ])
+     return np.identity(3) + math.sin(theta)*K + (1 - math.cos(theta))*(K @ K)
+
+
+class Transform:
+     def __init__(self, dimension=3):
+          """Initializes the identity transform for points of the given dimension"""
+
+          if dimension not in (2, 3):
+               raise InvalidTransformError("Only two and three dimensional transforms are supported")
+
+          self.dimension = dimension
+          self.matrix = np.identity(dimension + 1)
+
+     def __repr__(self):
+          return f"Transform(dimension={self.dimension})"
+
+     def __matmul__(self, other):
+          """Returns the transform applying other first and then self"""
+
+          if not (isinstance(other, Transform) and other.dimension == self.dimension):
+               raise InvalidTransformError("Invalid operands or invalid transform dimensions")
+
+          result = Transform(self.dimension)
+          result.matrix = self.matrix @ other.matrix
+          return result
+
+     def then(self, other):
+          """Returns the transform applying self first and then other"""
+
+          return other @ self
+
+     def _compose(self, matrix):
+          # every operation is left multiplied so that operations are applied in the order they were added
+          self.matrix = matrix @ self.matrix
+          return self
+
+     def linear(self, matrix):
+          """Appends a linear map given as a dxd matrix"""
+
+          matrix = np.asarray(matrix, dtype=float)
+          if matrix.shape != (self.dimension, self.dimension):
+               raise InvalidTransformError(f"Expected a {self.dimension}x{self.dimension} matrix, received {matrix.shape}")
+
+          homogeneous = np.identity(self.dimension + 1)
+          homogeneous[:self.dimension, :self.dimension] = matrix
+          return self._compose(homogeneous)
+
+     def translate(self, *offset):
+          """Appends a translation by the offset. Accepts the components or a single vector"""
+
+          if len(offset) == 1 and isinstance(offset[0], Vec):
+               offset = offset[0].components
+          if len(offset) != self.dimension:
+               raise InvalidTransformError("Invalid translation dimensions")
+
+          homogeneous = np.identity(self.dimension + 1)
+          homogeneous[:self.dimension, self.dimension] = offset
+          return self._compose(homogeneous)
+
+     def scale(self, *factors):
+          """Appends a scaling about the origin. A single factor scales every axis uniformly"""
+
+          if len(factors) == 1:
+               factors = factors * self.dimension
+          if len(factors) != self.dimension:
+               raise InvalidTransformError("Invalid scaling dimensions")
+
+          return self.linear(np.diag(factors))
+
+     def rotate(self, theta, axis=None):
+          """Appends a rotation by theta radians. Three dimensional transforms require the axis of rotation"""
+
+          if self.dimension == 2:
+               return self.linear(rotation_2d(theta))
+          if axis is None:
+               raise InvalidTransformError("Three dimensional rotations require an axis")
+          return self.linear(rotation_3d(axis, theta))
+
+     def inverse(self):
+          """Returns the transform undoing the current transform"""
+
+          result = Transform(self.dimension)
+          try:
+               result.matrix = np.linalg.inv(self.matrix)
+          except np.linalg.LinAlgError:
+               raise InvalidTransformError("The transform is not invertible")
+          return result
+
+     @property
+     def linear_part(self):
+          """Returns the dxd linear part of the homogeneous matrix"""
+          return self.matrix[:self.dimension, :self.dimension]
+
+     @property
+     def translation_part(self):
+          """Returns the translation part of the homogeneous matrix"""
+          return self.matrix[:self.dimension, self.dimension]
+
+     def _apply_array(self, points, out):
+          # x' = Ax + t for every row; matmul copies internally when out aliases points
+          np.matmul(points, self.linear_part.T, out=out)
+          out += self.translation_part
+          return out
+
+     def apply(self, points, inplace=False):
+          """
+          Applies the transform to a collection of points in a single vectorized pass.
+          Arrays of shape (n, d) are returned as arrays, vectors are returned as vectors of the same class.
+          With inplace=True the passed array (or the vectors' components) are overwritten
+          """
+
+          if isinstance(points, np.ndarray):
+               points_to_array(points, self.dimension, InvalidTransformError)
+               if inplace:
+                    if not np.issubdtype(points.dtype, np.floating):
+                         raise InvalidTransformError("In-place transforms require a floating point array")
+                    return self._apply_array(points, points)
+               return self._apply_array(points, np.empty(points.shape, dtype=np.result_type(points, float)))
+
+          if isinstance(points, Vec):
+               points = [points]
+               single = True
+          else:
+               points = list(points)
+               single = False
+
+          for point in points:
+               if not isinstance(point, Vec):
+                    raise InvalidTransformError(f"Expected vectors or an (n, {self.dimension}) array, received {type(point)}")
+               if len(point) != self.dimension:
+                    raise InvalidTransformError(f"Expected vectors of dimension {self.dimension}, received {len(point)}")
+
+          array = points_to_array(points, self.dimension, InvalidTransformError)
+          self._apply_array(array, array)
+
+          if inplace:
+               for point, row in zip(points, array.tolist()):
+                    point.components[:] = row
+          else:
+               points = [type(point)(*row, name=point.name) for point, row in zip(points, array.tolist())]
+          return points[0] if single else points
+
+     def apply_chunked(self, points, out=None, chunk_size=65536):
+          """
+          Applies the transform to an (n, d) array chunk by chunk so that only chunk_size rows are held in memory at once.
+          Intended for np.memmap point clouds larger than memory. Writes into out, or into points when out is None
+          """
+
+          points_to_array(points, self.dimension, InvalidTransformError)
+          if out is None:
+               out = points
+          if out.shape != points.shape:
+               raise InvalidTransformError("The output array must have the same shape as the points")
+          if not np.issubdtype(out.dtype, np.floating):
+               raise InvalidTransformError("Chunked transforms require a floating point output array")
+          if chunk_size <= 0:
+               raise InvalidTransformError("The chunk size must be positive")
+
+          for start in range(0, len(points), chunk_size):
+               stop = start + chunk_size
+               chunk = np.asarray(points[start:stop], dtype=float)
+               out[start:stop] = chunk @ self.linear_part.T + self.translation_part
+
+          if isinstance(out, np.memmap):
+               out.flush()
+          return out
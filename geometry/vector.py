@@ -1,4 +1,5 @@
 import math
+import numpy as np
 from sympy import Expr,sqrt
 
 class Vec:
@@ -108,6 +109,41 @@ class Vec:
           product = [a*b for a,b in zipped]
           return sum(product)
      
+     def cross(self, vector):
+          """
+          Returns the cross product of the current vector with the passed vector. Defined only for three dimensional vectors
+          """
+          if not(isinstance(vector, Vec) and len(self) == 3 and len(vector) == 3):
+               raise Exception("Invalid operands or invalid vector dimensions")
+          
+          a1,a2,a3 = self.components
+          b1,b2,b3 = vector.components
+          return type(self)(a2*b3 - a3*b2, a3*b1 - a1*b3, a1*b2 - a2*b1, check=False)
+     
+     def triple(self, b, c):
+          """
+          Returns the scalar triple product a.(b x c) where a is the current vector
+          """
+          return self.dot(b.cross(c))
+     
+     def transform(self, matrix):
+          """
+          Returns the vector obtained by applying the matrix to the current vector. Accepts either a
+          square matrix of the vector's dimension or a homogeneous (affine) matrix of one dimension more
+          """
+          matrix = np.asarray(matrix, dtype=float)
+          n = len(self)
+          
+          if matrix.shape == (n, n):
+               result = matrix @ np.asarray(self.components, dtype=float)
+          elif matrix.shape == (n+1, n+1):
+               result = matrix[:n, :n] @ np.asarray(self.components, dtype=float) + matrix[:n, n]
+          else:
+               raise Exception("Invalid matrix dimensions")
+          
+          # type(self) keeps Vector2D/Vector3D instances from collapsing into a plain Vec
+          return type(self)(*result.tolist(), name=self.name)
+     
      def normalize(self):
           """
           Returns the unit vector in the direction of the vector
@@ -247,4 +283,31 @@ class Vector3D(Vec):
           if not (isinstance(z, int) or isinstance(z, float)):
                     raise Exception("Invalid vector component")
           
-          self.components[2] = z
\ No newline at end of file
+          self.components[2] = z
+
+
+def points_to_array(points, dimension=None, error=ValueError):
+     """Returns an (n, d) float array holding the components of a collection of vectors. Raises error on a bad shape"""
+
+     if isinstance(points, np.ndarray):
+          array = points
+     else:
+          rows = [list(point) for point in points]
+          if len({len(row) for row in rows}) > 1:
+               raise error("The vectors do not share a single dimension")
+          array = np.array(rows, dtype=float)
+          if array.size == 0:
+               array = array.reshape(0, dimension or 0)
+
+     if array.ndim != 2 or (dimension is not None and array.shape[1] != dimension):
+          raise error(f"Expected an array of shape (n, {dimension or 'd'}), received {array.shape}")
+     return array
+
+
+def array_to_points(array, cls=None):
+     """Returns the rows of an (n, d) array as vectors. Picks Vector2D/Vector3D by dimension unless cls is given"""
+
+     if cls is None:
+          cls = {2: Vector2D, 3: Vector3D}.get(array.shape[1], Vec)
+     return [cls(*row) for row in array.tolist()]
+
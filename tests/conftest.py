@@ -0,0 +1,12 @@
+import importlib.util
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+# the modules import each other as linaris.*, so the checkout is registered under that name when it is not installed
+if importlib.util.find_spec("linaris") is None:
+     spec = importlib.util.spec_from_file_location("linaris", ROOT / "__init__.py", submodule_search_locations=[str(ROOT)])
+     module = importlib.util.module_from_spec(spec)
+     sys.modules["linaris"] = module
+     spec.loader.exec_module(module)
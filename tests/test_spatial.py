@@ -0,0 +1,130 @@
+import numpy as np
+import pytest
+
+from linaris.geometry.vector import Vector2D, Vector3D
+from linaris.geometry.spatial import KDTree, InvalidQueryError, pairwise_distances
+
+
+def brute_force(points, query):
+     return np.linalg.norm(points - query, axis=1)
+
+def clouds():
+     rng = np.random.default_rng(0)
+     yield rng.random((500, 2))
+     yield rng.random((500, 3))
+     # duplicate points and ties along the splitting axes
+     yield np.repeat(rng.integers(0, 5, (60, 3)).astype(float), 4, axis=0)
+
+@pytest.mark.parametrize("leaf_size", [1, 4, 16])
+@pytest.mark.parametrize("points", list(clouds()))
+def test_query_matches_brute_force(points, leaf_size):
+     tree = KDTree(points, leaf_size=leaf_size)
+     queries = np.random.default_rng(1).random((20, points.shape[1]))*points.max()
+
+     for query in queries:
+          distances, indices = tree.query(query, k=7)
+          expected = np.sort(brute_force(points, query))[:7]
+          assert np.allclose(distances, expected)
+          assert np.allclose(brute_force(points[indices], query), expected)
+
+@pytest.mark.parametrize("leaf_size", [1, 4, 16])
+@pytest.mark.parametrize("points", list(clouds()))
+def test_query_radius_matches_brute_force(points, leaf_size):
+     tree = KDTree(points, leaf_size=leaf_size)
+     radius = 0.2*points.max()
+
+     for query in points[::37]:
+          distances = brute_force(points, query)
+          indices = tree.query_radius(query, radius)
+          assert sorted(indices.tolist()) == np.nonzero(distances <= radius)[0].tolist()
+          assert np.all(np.diff(distances[indices]) >= 0)
+
+@pytest.mark.parametrize("leaf_size", [1, 4, 16])
+@pytest.mark.parametrize("points", list(clouds()))
+def test_query_box_matches_brute_force(points, leaf_size):
+     tree = KDTree(points, leaf_size=leaf_size)
+     half = 0.25*points.max()
+
+     for query in points[::37]:
+          lower, upper = query - half, query + half
+          expected = np.nonzero(np.all((points >= lower) & (points <= upper), axis=1))[0]
+          assert tree.query_box(lower, upper).tolist() == expected.tolist()
+
+def test_query_many():
+     points = np.random.default_rng(2).random((300, 3))
+     queries = np.random.default_rng(3).random((10, 3))
+     distances, _ = KDTree(points).query_many(queries, k=3)
+     assert np.allclose(distances, np.sort(pairwise_distances(queries, points), axis=1)[:, :3])
+
+def test_query_radius_many():
+     points = np.random.default_rng(4).random((200, 2))
+     results = KDTree(points).query_radius_many(points[:5], 0.1)
+     assert [sorted(r.tolist()) for r in results] == [np.nonzero(brute_force(points, q) <= 0.1)[0].tolist() for q in points[:5]]
+
+def test_nearest_returns_original_vector():
+     vectors = [Vector3D(0, 0, 0), Vector3D(5, 5, 5), Vector3D(1, 1, 1)]
+     assert KDTree(vectors).nearest(Vector3D(0.9, 1, 1.2)) is vectors[2]
+
+def test_nearest_on_array_returns_vector():
+     nearest = KDTree(np.array([[0.0, 0.0], [3.0, 4.0]])).nearest((3, 3))
+     assert isinstance(nearest, Vector2D)
+     assert nearest == Vector2D(3.0, 4.0)
+
+def test_k_larger_than_tree():
+     distances, indices = KDTree(np.array([[0.0, 0.0], [1.0, 0.0]])).query((0, 0), k=5)
+     assert distances.tolist() == [0.0, 1.0]
+     assert indices.tolist() == [0, 1]
+
+@pytest.mark.parametrize("call", [
+     lambda: KDTree(np.zeros(5)),
+     lambda: KDTree([Vector2D(1, 0), Vector3D(1, 2, 3)]),
+     lambda: KDTree(np.zeros((5, 3)), leaf_size=0),
+     lambda: KDTree(np.zeros((5, 3))).query((0, 0)),
+     lambda: KDTree(np.zeros((5, 3))).query((0, 0, 0), k=0),
+     lambda: KDTree(np.zeros((5, 3))).query_radius((0, 0, 0), -1),
+     lambda: KDTree(np.zeros((5, 3))).query_box((1, 1, 1), (0, 0, 0)),
+     lambda: KDTree(np.zeros((5, 3))).query_many(np.zeros((2, 2))),
+     lambda: KDTree(np.zeros((5, 3))).query_many(np.zeros((2, 3)), k=0),
+])
+def test_invalid_queries(call):
+     with pytest.raises(InvalidQueryError):
+          call()
+
+def test_pairwise_distances_far_from_origin():
+     points = np.array([[1e8, 1e8, 1e8], [1e8 + 1, 1e8, 1e8]])
+     assert pairwise_distances(points).tolist() == [[0.0, 1.0], [1.0, 0.0]]
+
+@pytest.mark.parametrize("block_size", [1, 7, 64])
+def test_pairwise_distances_blocks(block_size):
+     a = np.random.default_rng(5).random((50, 3))*1000
+     b = np.random.default_rng(6).random((30, 3))*1000
+     assert np.allclose(pairwise_distances(a, b, block_size=block_size), np.linalg.norm(a[:, None] - b[None], axis=2))
+     assert np.all(np.diag(pairwise_distances(a, block_size=block_size)) == 0)
+
+def test_pairwise_distances_into_memmap(tmp_path):
+     a = np.random.default_rng(7).random((40, 2))
+     out = np.memmap(tmp_path / "distances.dat", dtype=float, mode="w+", shape=(40, 40))
+     pairwise_distances(a, out=out, block_size=9)
+     assert np.allclose(out, np.linalg.norm(a[:, None] - a[None], axis=2))
+
+@pytest.mark.parametrize("block_size", [0, -1])
+def test_pairwise_distances_rejects_bad_block_size(block_size):
+     with pytest.raises(InvalidQueryError):
+          pairwise_distances(np.zeros((3, 2)), block_size=block_size)
+
+def test_query_many_on_empty_tree():
+     with pytest.raises(InvalidQueryError, match="empty"):
+          KDTree(np.zeros((0, 3))).query_many(np.zeros((2, 3)), k=1)
+
+@pytest.mark.parametrize("index", [0, 3, -1, -4])
+def test_point_matches_input(index):
+     points = np.random.default_rng(8).random((40, 3))
+     vectors = [Vector3D(*row) for row in points.tolist()]
+     assert KDTree(points, leaf_size=2).point(index) == vectors[index]
+     assert KDTree(vectors, leaf_size=2).point(index) is vectors[index]
+
+def test_build_leaves_input_untouched():
+     points = np.random.default_rng(9).random((100, 2))
+     original = points.copy()
+     KDTree(points, leaf_size=1)
+     assert np.array_equal(points, original)
@@ -0,0 +1,114 @@
+import math
+import numpy as np
+import pytest
+
+from linaris.geometry.vector import Vec, Vector2D, Vector3D
+from linaris.geometry.transform import Transform, InvalidTransformError, rotation_3d
+
+
+def test_cross_keeps_vector3d():
+     result = Vector3D(1, 0, 0).cross(Vector3D(0, 1, 0))
+     assert isinstance(result, Vector3D)
+     assert result == Vector3D(0, 0, 1)
+
+def test_cross_rejects_other_dimensions():
+     with pytest.raises(Exception):
+          Vec(1, 2).cross(Vec(3, 4))
+
+def test_triple_product_is_volume():
+     assert Vector3D(2, 0, 0).triple(Vector3D(0, 3, 0), Vector3D(0, 0, 4)) == 24
+
+def test_operations_apply_in_order():
+     # scale then translate differs from translate then scale
+     point = np.array([[1.0, 0.0, 0.0]])
+     scaled_first = Transform(3).scale(2).translate(1, 0, 0).apply(point)
+     translated_first = Transform(3).translate(1, 0, 0).scale(2).apply(point)
+     assert np.allclose(scaled_first, [[3, 0, 0]])
+     assert np.allclose(translated_first, [[4, 0, 0]])
+
+def test_matmul_and_then():
+     a = Transform(2).translate(1, 0)
+     b = Transform(2).rotate(math.pi/2)
+     point = np.array([[1.0, 0.0]])
+     assert np.allclose(a.then(b).apply(point), [[0, 2]])
+     assert np.allclose((a @ b).apply(point), [[1, 1]])
+
+def test_rotation_3d_about_z():
+     assert np.allclose(rotation_3d((0, 0, 5), math.pi/2) @ [1, 0, 0], [0, 1, 0])
+
+def test_inverse_round_trip():
+     transform = Transform(3).scale(2, 3, 4).rotate(0.7, (1, 2, 3)).translate(5, -1, 2)
+     points = np.random.default_rng(0).random((50, 3))
+     assert np.allclose(transform.inverse().apply(transform.apply(points)), points)
+
+def test_inverse_of_singular_transform():
+     with pytest.raises(InvalidTransformError):
+          Transform(3).scale(0).inverse()
+
+def test_apply_array_inplace():
+     points = np.random.default_rng(1).random((20, 3))
+     expected = Transform(3).translate(1, 2, 3).apply(points)
+     result = Transform(3).translate(1, 2, 3).apply(points, inplace=True)
+     assert result is points
+     assert np.allclose(points, expected)
+
+def test_apply_vectors_keeps_class():
+     result = Transform(2).translate(1, 1).apply([Vector2D(1, 2, name="a")])
+     assert isinstance(result[0], Vector2D)
+     assert result[0] == Vector2D(2.0, 3.0)
+     assert result[0].name == "a"
+
+def test_apply_single_vector_inplace():
+     vector = Vector3D(1, 2, 3)
+     result = Transform(3).translate(1, 1, 1).apply(vector, inplace=True)
+     assert result is vector
+     assert vector == Vector3D(2.0, 3.0, 4.0)
+
+def test_apply_single_vector_returns_copy():
+     vector = Vector3D(1, 2, 3)
+     result = Transform(3).translate(1, 1, 1).apply(vector)
+     assert isinstance(result, Vector3D)
+     assert vector == Vector3D(1, 2, 3)
+
+@pytest.mark.parametrize("transform, points", [
+     (Transform(3).rotate(math.pi/2, (0, 0, 1)).translate(1, 0, 0), Vec(1, 2, 3, 4)),
+     (Transform(2), Vec(1, 2, 3)),
+     (Transform(2), [Vector2D(1, 0), Vec(1, 2, 3)]),
+     (Transform(3), np.zeros((4, 2))),
+     (Transform(3), [(1, 2, 3)]),
+])
+def test_dimension_mismatch(transform, points):
+     with pytest.raises(InvalidTransformError):
+          transform.apply(points)
+
+def test_apply_chunked_memmap(tmp_path):
+     transform = Transform(3).scale(2).rotate(1.1, (0, 1, 1)).translate(3, 2, 1)
+     points = np.random.default_rng(2).random((1000, 3))
+     cloud = np.memmap(tmp_path / "cloud.dat", dtype=float, mode="w+", shape=points.shape)
+     cloud[:] = points
+
+     transform.apply_chunked(cloud, chunk_size=77)
+     reloaded = np.memmap(tmp_path / "cloud.dat", dtype=float, mode="r", shape=points.shape)
+     assert np.allclose(reloaded, transform.apply(points))
+
+def test_apply_chunked_into_output():
+     points = np.random.default_rng(3).random((100, 2))
+     out = np.empty_like(points)
+     Transform(2).translate(1, 1).apply_chunked(points, out=out, chunk_size=8)
+     assert np.allclose(out, points + 1)
+
+def test_apply_chunked_rejects_bad_chunk_size():
+     with pytest.raises(InvalidTransformError):
+          Transform(2).apply_chunked(np.zeros((4, 2)), chunk_size=0)
+
+@pytest.mark.parametrize("out", [None, np.zeros((2, 3), dtype=int)])
+def test_apply_chunked_rejects_integer_output(out):
+     points = np.arange(6).reshape(2, 3)
+     with pytest.raises(InvalidTransformError):
+          Transform(3).scale(0.5).apply_chunked(points, out=out)
+     assert points.tolist() == [[0, 1, 2], [3, 4, 5]]
+
+def test_apply_chunked_integer_points_into_float_output():
+     out = np.empty((2, 3))
+     Transform(3).scale(0.5).apply_chunked(np.arange(6).reshape(2, 3), out=out)
+     assert out.tolist() == [[0, 0.5, 1], [1.5, 2, 2.5]]